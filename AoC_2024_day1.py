@@ -1,6 +1,13 @@
-from aocd import get_data
+from aoc2024.inputs import get_data
 from typing import Sequence, Iterator
+from array import array
 from collections import Counter
+from itertools import groupby
+import heapq
+import os
+import tempfile
+import warnings
+import numpy as np
 
 def parse_numbers(inp: Sequence[str]) -> tuple[list[int], list[int]]:
     left, right = [], []
@@ -30,13 +37,156 @@ def pt2(inp):
     return sum([int(k)*v for k,v in count_left.items()])
 
 
+# bytes of input checked per block, so the layout check needs bounded memory
+LAYOUT_BLOCK = 1 << 20
+
+def count_pair_lines(data: str) -> int:
+    """Count the numbers in data, checking that each non-blank line has exactly two.
+
+    The text is scanned in blocks of whole lines of about LAYOUT_BLOCK bytes.
+    """
+    count = 0
+    start = 0
+    while start < len(data):
+        stop = data.find("\n", start + LAYOUT_BLOCK)
+        stop = len(data) if stop < 0 else stop + 1
+        raw = np.frombuffer(data[start:stop].encode(), dtype=np.uint8)
+        # a number starts where a non-space follows a space
+        space = raw <= ord(" ")
+        starts = ~space
+        starts[1:] &= space[:-1]
+        newline = raw == ord("\n")
+        # number starts and newlines in input order; newlines split it into lines
+        events = np.flatnonzero(starts | newline)
+        breaks = np.flatnonzero(newline[events])
+        per_line = np.diff(breaks, prepend=-1, append=events.size) - 1
+        # blank lines are skipped, every other line needs exactly two numbers
+        if np.any((per_line != 0) & (per_line != 2)):
+            raise ValueError("Each line must contain exactly two numbers")
+        count += events.size - breaks.size
+        start = stop
+    return count
+
+def parse_numbers_array(data: str) -> tuple[np.ndarray, np.ndarray]:
+    """Parse the whole input in bulk into two int64 arrays.
+
+    Each non-empty line must hold exactly two numbers, like parse_numbers.
+    """
+    count = count_pair_lines(data)
+    if not count:
+        # numpy reads whitespace-only input as a single 0
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    with warnings.catch_warnings():
+        # older numpy warns when it stops parsing early, newer numpy raises
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(data, dtype=np.int64, sep=" ")
+        except (DeprecationWarning, ValueError):
+            raise ValueError("Invalid format in input")
+    if values.size != count:
+        raise ValueError("Invalid format in input")
+    pairs = values.reshape(-1, 2)
+    return pairs[:, 0].copy(), pairs[:, 1].copy()
+
+def similarity_score_array(left: np.ndarray, right: np.ndarray) -> int:
+    if not left.size:
+        raise ValueError("Input cannot be empty")
+    return int(np.abs(np.sort(left) - np.sort(right)).sum())
+
+def pt2_array(left: np.ndarray, right: np.ndarray) -> int:
+    # like pt2, each distinct left value is counted once
+    keys = np.unique(left)
+    values, counts = np.unique(right, return_counts=True)
+    if not values.size:
+        return 0
+    idx = np.searchsorted(values, keys)
+    idx[idx == values.size] = 0
+    matched = values[idx] == keys
+    return int((keys[matched] * counts[idx[matched]]).sum())
+
+def _spill_run(values: array, directory: str) -> str:
+    values = array("q", sorted(values))
+    fd, run_path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        values.tofile(f)
+    return run_path
+
+def spill_sorted_runs(path: str, run_size: int, directory: str) -> tuple[list[str], list[str]]:
+    """Read at most run_size pairs at a time, sort each run and spill it to disk."""
+    left_runs, right_runs = [], []
+    left, right = array("q"), array("q")
+    with open(path) as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            try:
+                lf, rt = line.split()
+                left.append(int(lf))
+                right.append(int(rt))
+            except ValueError:
+                raise ValueError(f"Invalid format at line {i}")
+            if len(left) >= run_size:
+                left_runs.append(_spill_run(left, directory))
+                right_runs.append(_spill_run(right, directory))
+                left, right = array("q"), array("q")
+    if left:
+        left_runs.append(_spill_run(left, directory))
+        right_runs.append(_spill_run(right, directory))
+    return left_runs, right_runs
+
+def iter_run(run_path: str, block_size: int) -> Iterator[int]:
+    with open(run_path, "rb") as f:
+        while True:
+            block = array("q")
+            try:
+                block.fromfile(f, block_size)
+            except EOFError:
+                # the final, partial block is still filled in
+                yield from block
+                return
+            yield from block
+
+def merge_runs(run_paths: list[str], block_size: int) -> Iterator[int]:
+    """k-way merge of sorted run files into one sorted stream."""
+    return heapq.merge(*(iter_run(p, block_size) for p in run_paths))
+
+def count_join(left: Iterator[int], right: Iterator[int]) -> int:
+    """Streaming version of pt2 over two sorted streams."""
+    right_groups = ((k, sum(1 for _ in g)) for k, g in groupby(right))
+    value, count = next(right_groups, (None, 0))
+    result = 0
+    for key, _ in groupby(left):
+        while value is not None and value < key:
+            value, count = next(right_groups, (None, 0))
+        if value == key:
+            result += key * count
+    return result
+
+def solve_external(path: str, run_size: int = 1_000_000, block_size: int = 8192,
+                   tmpdir: str | None = None) -> tuple[int, int]:
+    """Solve both parts with bounded memory: sorted runs on disk, merged as streams.
+
+    Memory holds at most run_size pairs while spilling and one block of
+    block_size values per run while merging.
+    """
+    with tempfile.TemporaryDirectory(dir=tmpdir) as directory:
+        left_runs, right_runs = spill_sorted_runs(path, run_size, directory)
+        if not left_runs:
+            raise ValueError("Input cannot be empty")
+        distance = sum(abs(x - y) for x, y in zip(merge_runs(left_runs, block_size),
+                                                  merge_runs(right_runs, block_size)))
+        similarity = count_join(merge_runs(left_runs, block_size),
+                                merge_runs(right_runs, block_size))
+    return distance, similarity
+
 
 if __name__ == "__main__":
     data = get_data(year=2024,day=1)
-    inp = data.splitlines()
-    result = similarity_score(inp)
+    left, right = parse_numbers_array(data)
+    result = similarity_score_array(left, right)
     print(f"Part 1: {result}")
 
 
-    result_pt2 = pt2(inp)
+    result_pt2 = pt2_array(left, right)
     print(f"Part 2: {result_pt2}")
\ No newline at end of file
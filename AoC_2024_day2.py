@@ -1,4 +1,6 @@
-from aocd import get_data
+from aoc2024.inputs import get_data
+from itertools import chain
+import numpy as np
 
 def is_monotonic(line):
     asd = all(line[i]<=line[i+1] for i in range(len(line)-1))
@@ -12,23 +14,98 @@ def is_safe(line):
     safe = is_monotonic(line) and check_diff(line)
     return 1 if safe else 0
 
+def is_step(a, b, sign):
+    """检查相邻两个值是否沿方向 sign (1 递增, -1 递减) 变化 1 到 3"""
+    return 1 <= (b - a) * sign <= 3
+
+def first_violation(line, sign, skip=-1, start=0):
+    """返回跳过下标 skip 后第一个不合规相邻对的前一个下标，没有则返回 -1"""
+    prev = -1
+    for i in range(start, len(line)):
+        if i == skip:
+            continue
+        if prev >= 0 and not is_step(line[prev], line[i], sign):
+            return prev
+        prev = i
+    return -1
+
+def is_safe_dampened(line):
+    """线性时间检查最多移除一个值后是否安全，不复制列表"""
+    for sign in (1, -1):
+        i = first_violation(line, sign)
+        if i < 0:
+            return 1
+        # 第一个不合规相邻对是 (i, i+1)，只能移除这两个值之一；
+        # i 之前的部分已合规，从 i-1 开始检查即可
+        j = i + 1
+        if first_violation(line, sign, skip=i, start=max(i - 1, 0)) < 0:
+            return 1
+        if first_violation(line, sign, skip=j, start=i) < 0:
+            return 1
+    return 0
+
 def pt2(not_safe_pt1):
-    result = 0
-    for line in not_safe_pt1:
-        found_valid = False
-        for i in range(len(line)):
-            removed = line[:i] + line[i+1:]
-            if is_safe(removed):
-                found_valid = True
-                break
-        if found_valid:
-            result += 1
-    return result
+    return sum(is_safe_dampened(line) for line in not_safe_pt1)
     
 def pt2_alt(not_safe_pt1):
     result = sum(1 for line in not_safe_pt1 if any(is_safe(line[:i] + line[i+1:]) for i in range(len(line))))
     return result
 
+def pack_reports(reports):
+    """把所有报告打包成补零的二维数组和长度向量"""
+    lengths = np.fromiter(map(len, reports), dtype=np.int64, count=len(reports))
+    width = int(lengths.max(initial=0))
+    levels = np.zeros((len(reports), width), dtype=np.int64)
+    mask = np.arange(width) < lengths[:, None]
+    levels[mask] = np.fromiter(chain.from_iterable(reports), dtype=np.int64, count=int(lengths.sum()))
+    return levels, lengths
+
+def step_ok(diffs, sign):
+    """向量化的 is_step"""
+    steps = diffs * sign
+    return (steps >= 1) & (steps <= 3)
+
+def batch_is_safe(levels, lengths):
+    """批量计算 is_safe，返回布尔向量"""
+    cols = np.arange(max(levels.shape[1] - 1, 0))
+    # 补零部分的相邻对视为合规
+    padding = cols >= lengths[:, None] - 1
+    diffs = np.diff(levels, axis=1)
+    return ((step_ok(diffs, 1) | padding).all(axis=1) |
+            (step_ok(diffs, -1) | padding).all(axis=1))
+
+def batch_is_safe_dampened(levels, lengths):
+    """批量计算最多移除一个值后是否安全，返回布尔向量
+
+    对每个被移除的下标 k，用前缀/后缀合规标记和跨过 k 的相邻对组合得到结果。
+    """
+    n, width = levels.shape
+    result = batch_is_safe(levels, lengths)
+    if width == 0:
+        return result
+    cols = np.arange(width)
+    diffs = np.diff(levels, axis=1)
+    pair_padding = cols[:-1] >= lengths[:, None] - 1
+    # 移除 k (1 <= k <= width-2) 后新的相邻对 (k-1, k+1)
+    bridge = levels[:, 2:] - levels[:, :-2]
+    bridge_padding = cols[1:-1] + 1 >= lengths[:, None]
+    removable = cols < lengths[:, None]
+
+    for sign in (1, -1):
+        ok = step_ok(diffs, sign) | pair_padding
+        # prefix[:, j]: 前 j 个相邻对都合规; suffix[:, j]: 从第 j 个起都合规
+        prefix = np.ones((n, width), dtype=bool)
+        prefix[:, 1:] = np.logical_and.accumulate(ok, axis=1)
+        suffix = np.ones((n, width), dtype=bool)
+        suffix[:, :-1] = np.logical_and.accumulate(ok[:, ::-1], axis=1)[:, ::-1]
+        bridge_ok = np.ones((n, width), dtype=bool)
+        bridge_ok[:, 1:-1] = step_ok(bridge, sign) | bridge_padding
+
+        before = prefix[:, np.maximum(cols - 1, 0)]
+        after = suffix[:, np.minimum(cols + 1, width - 1)]
+        result |= (before & bridge_ok & after & removable).any(axis=1)
+    return result
+
 if __name__ == "__main__":
     data = get_data(year=2024,day=2)
     inp = [[int(y) for y in x.split(' ')] for x in data.splitlines()]
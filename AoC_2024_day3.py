@@ -1,4 +1,8 @@
-from aocd import get_data
+from aoc2024.inputs import open_input
+from concurrent.futures import ProcessPoolExecutor
+import codecs
+import mmap
+import os
 import re
 
 def pt1(data):
@@ -12,17 +16,27 @@ def pt1(data):
 
 
 
+INSTRUCTION_PATTERN = re.compile(r'(do\(\))|(don\'t\(\))|mul\((\d+),(\d+)\)')
+# 可能在分块边界被截断的指令前缀
+PARTIAL_PATTERN = re.compile(r"(?:m(?:u(?:l(?:\((?:\d+(?:,\d*)?)?)?)?)?|d(?:o(?:\(|n(?:'(?:t\(?)?)?)?)?)\Z")
+
 class MulInstructionProcessor:
-    def __init__(self):
+    def __init__(self, use_conditionals=True):
         # 初始状态，默认启用指令
         self.mul_enabled = True
-        self.results = []
+        # use_conditionals 为 False 时忽略 do()/don't() (part 1)
+        self.use_conditionals = use_conditionals
+        self.total = 0
+        # 上一块末尾未完成的指令
+        self._pending = ''
     
-    def process_text(self,text):
-        matches = re.finditer(r'(do\(\))|(don\'t\(\))|mul\((\d+),(\d+)\)',text)
-
-        for m in matches:
+    def feed(self, chunk):
+        """处理一块文本，末尾不完整的指令留到下一块"""
+        text = self._pending + chunk
+        last_end = 0
+        for m in INSTRUCTION_PATTERN.finditer(text):
             full_match = m.group(0)
+            last_end = m.end()
             # 处理do()指令
             if full_match == 'do()':
                 self.mul_enabled = True
@@ -31,22 +45,167 @@ class MulInstructionProcessor:
             elif full_match == 'don\'t()':
                 self.mul_enabled = False
 
-            elif full_match.startswith('mul('):
-                if self.mul_enabled:
-                    # 提取两个数字并计算乘积
-                    num1, num2 = map(int, full_match[4:-1].split(','))
-                    self.results.append(num1 * num2)
-        
-        return sum(self.results)
+            elif self.mul_enabled or not self.use_conditionals:
+                # 提取两个数字并计算乘积
+                self.total += int(m.group(3)) * int(m.group(4))
+
+        partial = PARTIAL_PATTERN.search(text, last_end)
+        self._pending = partial.group(0) if partial else ''
+        return self.total
+
+    def finish(self):
+        """结束输入，丢弃末尾不完整的指令并返回累计结果"""
+        self._pending = ''
+        return self.total
+
+    def process_stream(self, stream, chunk_size=1 << 20, encoding='utf-8'):
+        """从文件或管道中分块读取并处理，文本流和二进制流都可以
+
+        二进制流用增量解码器解码，块边界上被截断的多字节字符留到下一块。
+        """
+        decoder = None
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, (bytes, bytearray, memoryview)):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(encoding)()
+                chunk = decoder.decode(chunk)
+            self.feed(chunk)
+        if decoder is not None:
+            self.feed(decoder.decode(b'', final=True))
+        return self.finish()
+
+    def process_text(self,text):
+        self.feed(text)
+        return self.finish()
 def pt2(text):
     processor = MulInstructionProcessor()
     return processor.process_text(text)
 
+"""手写扫描器"""
+def scan_both(buf):
+    """单次扫描 bytes 或 mmap，同时返回 (part 1 结果, part 2 结果)
+
+    用 bytes.find 直接跳到下一个 'mul('，参数只在它与下一个 'mul(' 之间找 ')'，
+    do()/don't() 的位置单独查找，按位置切换启用状态。
+    memoryview 没有 find，只接受覆盖整个 bytes/mmap 的视图，直接扫描其底层对象；
+    部分视图请自行传入 bytes(view)，避免在这里悄悄复制整个输入。
+    """
+    if isinstance(buf, memoryview):
+        if not (isinstance(buf.obj, (bytes, mmap.mmap)) and buf.nbytes == len(buf.obj)):
+            raise TypeError("scan_both 需要 bytes、mmap 或覆盖它们全部内容的 memoryview")
+        buf = buf.obj
+    n = len(buf)
+    find = buf.find
+    total_pt1 = total_pt2 = 0
+    enabled = True
+    next_do, next_dont = find(b'do()'), find(b"don't()")
+    pos = find(b'mul(')
+    while pos >= 0:
+        # 处理 pos 之前出现的 do()/don't()
+        while 0 <= next_do < pos or 0 <= next_dont < pos:
+            if next_dont < 0 or 0 <= next_do < next_dont:
+                enabled = True
+                next_do = find(b'do()', next_do + 4)
+            else:
+                enabled = False
+                next_dont = find(b"don't()", next_dont + 7)
+        start = pos + 4
+        pos = find(b'mul(', start)
+        close = find(b')', start, n if pos < 0 else pos)
+        if close > 0:
+            left, _, right = buf[start:close].partition(b',')
+            # isdigit 对空串返回 False，也排除了第二个逗号
+            if left.isdigit() and right.isdigit():
+                product = int(left) * int(right)
+                total_pt1 += product
+                if enabled:
+                    total_pt2 += product
+    return total_pt1, total_pt2
+
+"""并行扫描"""
+BYTES_PATTERN = re.compile(rb'(do\(\))|(don\'t\(\))|mul\((\d+),(\d+)\)')
+# 指令中可能出现的字节，分块边界不能落在这些字节上
+TOKEN_BYTES = frozenset(b"mul(),0123456789don't")
+
+def scan_summary(buf, start=0, end=None):
+    """扫描 buf[start:end]，返回 (起始启用时的和, 起始禁用时的和, 结束状态)
+
+    结束状态为 None 表示该块中没有 do()/don't()，状态保持不变。
+    """
+    if end is None:
+        end = len(buf)
+    sums = [0, 0]
+    # 分别跟踪起始为启用/禁用两种情况
+    enabled = [True, False]
+    final_state = None
+    for m in BYTES_PATTERN.finditer(buf, start, end):
+        if m.group(1):
+            enabled = [True, True]
+            final_state = True
+        elif m.group(2):
+            enabled = [False, False]
+            final_state = False
+        else:
+            product = int(m.group(3)) * int(m.group(4))
+            for i in range(2):
+                if enabled[i]:
+                    sums[i] += product
+    return sums[0], sums[1], final_state
+
+def combine_summaries(summaries, enabled=True):
+    """按顺序合并各块的摘要，返回总和"""
+    total = 0
+    for if_enabled, if_disabled, final_state in summaries:
+        total += if_enabled if enabled else if_disabled
+        if final_state is not None:
+            enabled = final_state
+    return total
+
+def find_chunk_bounds(buf, n_chunks):
+    """把 buf 切成约 n_chunks 块，边界挪到不属于任何指令的字节上"""
+    size = len(buf)
+    step = max(1, size // max(1, n_chunks))
+    bounds = [0]
+    pos = step
+    while pos < size:
+        while pos < size and buf[pos] in TOKEN_BYTES:
+            pos += 1
+        if pos < size:
+            bounds.append(pos)
+        pos += step
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+# 工作进程内映射的文件
+_worker_map = None
+
+def _init_worker(path):
+    global _worker_map
+    with open(path, 'rb') as f:
+        _worker_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _scan_range(bounds):
+    return scan_summary(_worker_map, *bounds)
+
+def pt2_parallel(path, workers=None, chunks_per_worker=4):
+    """内存映射文件，分块在进程池中扫描，再合并摘要，结果与 pt2 相同"""
+    if os.path.getsize(path) == 0:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = find_chunk_bounds(mm, workers * chunks_per_worker)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(path,)) as executor:
+        return combine_summaries(executor.map(_scan_range, bounds))
+
 if __name__=="__main__":
-    data = get_data(year=2024,day=3)
-    pt1 = pt1(data)
-    print(f'part 1: {pt1}')
-    pt2 = pt2(data)
-    print(f'part 2: {pt2}')
+    # 直接扫描内存映射的输入，一次得到两部分结果
+    with open_input(year=2024, day=3) as puzzle:
+        result_pt1, result_pt2 = scan_both(puzzle.data)
+    print(f'part 1: {result_pt1}')
+    print(f'part 2: {result_pt2}')
 
 
@@ -1,12 +1,8 @@
-from aocd import get_data
+from aoc2024.inputs import get_data
+from collections import deque
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import Iterator, List, Tuple
-
-@dataclass(frozen=True)
-class Position:
-    row: int
-    col: int
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
+import numpy as np
 
 @dataclass(frozen=True)
 class Direction:
@@ -15,7 +11,6 @@ class Direction:
 
 # 定义常量
 TARGET = "XMAS"
-TARGET_LEN = len(TARGET)
 
 # 8个方向定义为Direction对象
 DIRECTIONS = [
@@ -29,41 +24,141 @@ DIRECTIONS = [
     Direction(-1, 1)   # 右上
 ]
 
-def is_valid(pos: Position, direction: Direction) -> bool:
-    """检查给定位置和方向是否在矩阵范围内"""
-    end_row = pos.row + direction.dx * (TARGET_LEN - 1)
-    end_col = pos.col + direction.dy * (TARGET_LEN - 1)
-    return (0 <= pos.row < len(matrix) and 
-            0 <= pos.col < len(matrix[0]) and
-            0 <= end_row < len(matrix) and 
-            0 <= end_col < len(matrix[0]))
-
-@lru_cache(maxsize=None)
-def get_word(pos: Position, direction: Direction) -> str:
-    """获取指定位置和方向上的单词"""
-    return ''.join(
-        matrix[pos.row + direction.dx * i][pos.col + direction.dy * i]
-        for i in range(TARGET_LEN)
-    )
-
-def find_possible_positions() -> Iterator[Tuple[Position, Direction]]:
-    """生成矩阵中所有可能的位置和方向组合"""
-    height, width = len(matrix), len(matrix[0])
-    for row in range(height):
-        for col in range(width):
-            pos = Position(row, col)
-            for direction in DIRECTIONS:
-                if is_valid(pos, direction):
-                    yield pos, direction
-
-def find_all_xmas() -> int:
-    """在矩阵中查找所有'XMAS'出现的次数"""
-    return sum(
-        get_word(pos, direction) == TARGET
-        for pos, direction in find_possible_positions()
-    )
+# 每次处理的起点行数，限制临时布尔数组的大小
+BAND_ROWS = 1024
+
+def load_grid(data: Union[str, bytes, np.ndarray]) -> np.ndarray:
+    """把输入文本直接转换为二维 uint8 数组
+
+    数组是原始字节上跳过换行符的跨步视图，不会逐个字符建立列表；已经是数组时原样返回。
+    """
+    if isinstance(data, np.ndarray):
+        return data
+    raw = data.encode('latin-1') if isinstance(data, str) else bytes(data)
+    if b'\r' in raw:
+        raw = raw.replace(b'\r\n', b'\n')
+    end = len(raw)
+    while end and raw[end - 1] == ord('\n'):
+        end -= 1
+    width = raw.find(b'\n', 0, end)
+    if width < 0:
+        width = end
+    if not width:
+        raise ValueError("矩阵不能为空")
+    height, remainder = divmod(end + 1, width + 1)
+    if remainder or raw.count(b'\n', 0, end) != height - 1:
+        raise ValueError("矩阵必须是规则的（所有行长度相同）")
+    flat = np.frombuffer(raw, dtype=np.uint8, count=end)
+    # 换行符总数已对上，还要每一行都恰好在第 width 个字节处结束
+    if not (flat[width::width + 1] == ord('\n')).all():
+        raise ValueError("矩阵必须是规则的（所有行长度相同）")
+    return np.lib.stride_tricks.as_strided(flat, shape=(height, width),
+                                           strides=(width + 1, 1), writeable=False)
+
+def count_word(grid: np.ndarray, word: str, directions: Sequence[Direction] = DIRECTIONS) -> int:
+    """用平移切片比较统计单词在各方向上出现的次数"""
+    height, width = grid.shape
+    codes = word.encode('latin-1')
+    span = len(codes) - 1
+    total = 0
+    for direction in directions:
+        # 起点范围保证整个单词都在矩阵内
+        row_start = max(0, -direction.dx * span)
+        row_stop = height - max(0, direction.dx * span)
+        col_start = max(0, -direction.dy * span)
+        col_stop = width - max(0, direction.dy * span)
+        if row_stop <= row_start or col_stop <= col_start:
+            continue
+        for band in range(row_start, row_stop, BAND_ROWS):
+            band_stop = min(band + BAND_ROWS, row_stop)
+            mask = np.ones((band_stop - band, col_stop - col_start), dtype=bool)
+            for i, code in enumerate(codes):
+                r, c = direction.dx * i, direction.dy * i
+                mask &= grid[band + r:band_stop + r, col_start + c:col_stop + c] == code
+            total += int(np.count_nonzero(mask))
+    return total
+
+class AhoCorasick:
+    """多模式匹配自动机，一次扫描统计所有单词的出现次数"""
+
+    def __init__(self, words: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.terminals: Dict[str, int] = {}
+        for word in words:
+            if not word:
+                raise ValueError("单词不能为空")
+            node = 0
+            for char in word:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.terminals[word] = node
+
+        # 按广度优先顺序建立失败指针
+        self.order: List[int] = []
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            self.order.append(node)
+            for char, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                queue.append(child)
+
+    def count(self, lines: Iterable[str]) -> Dict[str, int]:
+        """依次扫描每一行，返回每个单词的出现次数"""
+        goto, fail = self.goto, self.fail
+        hits = [0] * len(goto)
+        for line in lines:
+            node = 0
+            for char in line:
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                hits[node] += 1
+        # 从深到浅沿失败指针累加，得到以每个节点为后缀的匹配次数
+        for node in reversed(self.order):
+            hits[self.fail[node]] += hits[node]
+        return {word: hits[node] for word, node in self.terminals.items()}
+
+class WordFinder:
+    """单词查找器，每个实例持有自己的矩阵，不使用缓存"""
+
+    def __init__(self, data: Union[str, bytes, np.ndarray], target: str = TARGET):
+        self.grid = load_grid(data)
+        self.height, self.width = self.grid.shape
+        self.target = target
+
+    def find_all_xmas(self) -> int:
+        """在矩阵中查找所有目标单词出现的次数"""
+        return count_word(self.grid, self.target)
+
+    def iter_lines(self) -> Iterator[str]:
+        """生成所有行、列和两组对角线，每条线正反各一次"""
+        grid, mirrored = self.grid, self.grid[:, ::-1]
+        lines = list(grid) + list(grid.T)
+        # 左上到右下、右上到左下的对角线
+        for offset in range(-(self.height - 1), self.width):
+            lines.append(grid.diagonal(offset))
+            lines.append(mirrored.diagonal(offset))
+        for line in lines:
+            text = line.tobytes().decode('latin-1')
+            yield text
+            yield text[::-1]
+
+    def count_words(self, words: Iterable[str]) -> Dict[str, int]:
+        """用 Aho-Corasick 自动机一次扫描统计多个单词在 8 个方向上的出现次数"""
+        return AhoCorasick(words).count(self.iter_lines())
 
 if __name__ == "__main__":
-    data = get_data(year=2024, day=4)
-    matrix = [list(line) for line in data.splitlines()]
-    print(find_all_xmas())
+    try:
+        data = get_data(year=2024, day=4)
+        finder = WordFinder(data)
+        print(finder.find_all_xmas())
+    except ValueError as e:
+        print(f"错误: {e}")
@@ -1,9 +1,8 @@
-from aocd import get_data
+from aoc2024.inputs import get_data
+from AoC_2024_day4_pt1 import BAND_ROWS, load_grid
 from dataclasses import dataclass
-from typing import List, Tuple, Iterator
-from functools import partial
-from itertools import product
-import time
+from typing import Optional, Union
+import numpy as np
 
 @dataclass(frozen=True)
 class Point:
@@ -11,46 +10,18 @@ class Point:
     row: int
     col: int
 
-    def __add__(self, other: 'Point') -> 'Point':
-        return Point(self.row + other.row, self.col + other.col)
-
-    def get_value(self, matrix: List[List[str]]) -> str:
-        """获取点在矩阵中的值，如果点不在矩阵范围内返回空字符串"""
-        if not (0 <= self.row < len(matrix) and 0 <= self.col < len(matrix[0])):
-            return ''
-        return matrix[self.row][self.col]
-
 class Matrix:
     """矩阵类，包含所有矩阵操作"""
-    def __init__(self, data: List[List[str]]):
-        if not data or not data[0]:
-            raise ValueError("矩阵不能为空")
-        if not all(len(row) == len(data[0]) for row in data):
-            raise ValueError("矩阵必须是规则的（所有行长度相同）")
-        self.data = data
-        self.height = len(data)
-        self.width = len(data[0])
-
-    def is_valid_point(self, point: Point) -> bool:
-        """检查点是否在矩阵范围内"""
-        return 0 <= point.row < self.height and 0 <= point.col < self.width
-
-    def get_word(self, center: Point, offsets: List[Point]) -> str:
-        """获取给定中心点和偏移量列表对应的单词"""
-        return ''.join(
-            (center + offset).get_value(self.data)
-            for offset in offsets
-        )
+    def __init__(self, data: Union[str, bytes, np.ndarray]):
+        self.array = load_grid(data)
+        self.height, self.width = self.array.shape
 
-    def iter_points(self) -> Iterator[Point]:
-        """生成所有可能的点（跳过边缘）"""
-        return (
-            Point(row, col)
-            for row, col in product(
-                range(1, self.height - 1),
-                range(1, self.width - 1)
-            )
-        )
+    def shifted(self, offset: Point, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """返回非边缘点中第 start 到 stop 行加上偏移量后的值组成的切片"""
+        if stop is None:
+            stop = self.height - 2
+        return self.array[1 + start + offset.row:1 + stop + offset.row,
+                          1 + offset.col:self.width - 1 + offset.col]
 
 class XMASFinder:
     """XMAS图案查找器"""
@@ -66,36 +37,34 @@ class XMASFinder:
     def __init__(self, matrix: Matrix):
         self.matrix = matrix
 
-    def is_valid_center(self, point: Point) -> bool:
-        """检查点是否是有效的中心点"""
-        return (point.get_value(self.matrix.data) == self.CENTER_CHAR and
-                all(self.matrix.is_valid_point(point + offset)
-                    for diagonal in self.DIAGONALS
-                    for offset in diagonal))
-
-    def check_point(self, point: Point) -> bool:
-        """检查一个点是否形成XMAS图案"""
-        if not self.is_valid_center(point):
-            return False
-
-        return all(
-            self.matrix.get_word(point, diagonal) in self.VALID_WORDS
-            for diagonal in self.DIAGONALS
-        )
-
-    def count_patterns(self) -> Tuple[int, float]:
-        """统计所有XMAS图案
-        返回：(找到的图案数量, 执行时间)
+    def count_patterns(self) -> int:
+        """统计所有XMAS图案，按 BAND_ROWS 行一段处理，限制临时布尔数组的大小
+        返回：找到的图案数量
         """
 
-        count = sum(map(self.check_point, self.matrix.iter_points()))
-        return count
-
+        if self.matrix.height < 3 or self.matrix.width < 3:
+            return 0
+        rows = self.matrix.height - 2
+        total = 0
+        for start in range(0, rows, BAND_ROWS):
+            stop = min(start + BAND_ROWS, rows)
+            mask = self.matrix.shifted(Point(0, 0), start, stop) == ord(self.CENTER_CHAR)
+            for diagonal in self.DIAGONALS:
+                # 对角线上的三个字符需要组成任一有效单词
+                diagonal_mask = np.zeros_like(mask)
+                for word in self.VALID_WORDS:
+                    word_mask = mask.copy()
+                    for offset, char in zip(diagonal, word):
+                        word_mask &= self.matrix.shifted(offset, start, stop) == ord(char)
+                    diagonal_mask |= word_mask
+                mask &= diagonal_mask
+            total += int(np.count_nonzero(mask))
+        return total
 
 if __name__ == "__main__":
     try:
         data = get_data(year=2024, day=4)
-        matrix = Matrix([list(line) for line in data.splitlines()])
+        matrix = Matrix(data)
         finder = XMASFinder(matrix)
         count = finder.count_patterns()
         print(f"找到 {count} 个X-MAS图案")
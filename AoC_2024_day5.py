@@ -1,44 +1,67 @@
-from aocd import get_data
-from typing import List, Tuple
-import networkx as nx
+from aoc2024.inputs import get_data
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+import heapq
 
+# Set of (before, after) pairs; looking up a single ordering constraint is O(1)
+RuleIndex = Set[Tuple[int, int]]
 
-def data_process() -> Tuple[List[Tuple[int, int]], List[List[int]]]:
+
+def build_rule_index(rules: Iterable[Tuple[int, int]]) -> RuleIndex:
+    """
+    Build the rule index used for validating and sorting sequences.
+    
+    Args:
+        rules: Iterable of (before, after) pairs
+        
+    Returns:
+        RuleIndex: Set of (before, after) pairs
+    """
+    return set(rules)
+
+
+def data_process(data: Optional[str] = None) -> Tuple[RuleIndex, List[List[int]]]:
     """
     Process the input data from Advent of Code.
     
+    Args:
+        data: Puzzle input; loaded from the input store when omitted
+        
     Returns:
-        Tuple containing processed rules and sequences.
+        Tuple containing the rule index and sequences.
     """
     try:
-        data = get_data(year=2024, day=5).split('\n\n')
+        if data is None:
+            data = get_data(year=2024, day=5)
+        data = data.split('\n\n')
         if len(data) < 2:
             raise ValueError("Invalid input data format")
             
-        rules = [tuple(map(int, rule.split('|'))) for rule in data[0].split('\n')]
+        rules = build_rule_index(tuple(map(int, rule.split('|'))) for rule in data[0].split('\n'))
         seqs = [list(map(int, x.split(','))) for x in data[1].split('\n')]
         return rules, seqs
     except Exception as e:
         raise ValueError(f"Error processing data: {e}")
 
 
-def is_valid_seq(rules: List[Tuple[int, int]], seq: List[int]) -> bool:
+def is_valid_seq(rules: RuleIndex, seq: List[int]) -> bool:
     """
     Check if a sequence is valid according to the rules.
     
+    Only the O(k^2) pairs within the sequence are looked up in the index,
+    independent of the total number of rules.
+    
     Args:
-        rules: List of (before, after) pairs representing rules
+        rules: Rule index of (before, after) pairs
         seq: Sequence to validate
         
     Returns:
         bool: True if sequence is valid, False otherwise
     """
-    # Create position mapping for O(1) lookup
-    pos_map = {num: idx for idx, num in enumerate(seq)}
-    
-    for before, after in rules:
-        if before in pos_map and after in pos_map:
-            if pos_map[before] > pos_map[after]:
+    for i, earlier in enumerate(seq):
+        for later in seq[i + 1:]:
+            # A rule requiring `later` before `earlier` is violated
+            if (later, earlier) in rules:
                 return False
     return True
 
@@ -56,12 +79,12 @@ def get_middle_number(seq: List[int]) -> int:
     return seq[len(seq) // 2]
 
 
-def part1(rules: List[Tuple[int, int]], seqs: List[List[int]]) -> int:
+def part1(rules: RuleIndex, seqs: List[List[int]]) -> int:
     """
     Solve part 1 of the puzzle.
     
     Args:
-        rules: List of rules
+        rules: Rule index of (before, after) pairs
         seqs: List of sequences to check
         
     Returns:
@@ -71,51 +94,88 @@ def part1(rules: List[Tuple[int, int]], seqs: List[List[int]]) -> int:
 
 
 """part 2"""
-def build_graph(rules: List[Tuple[int, int]], seq: List[int]) -> nx.DiGraph:
+def iter_topological_order(rules: RuleIndex, seq: List[int]) -> Iterator[int]:
     """
-    Build a directed graph from rules and sequence.
+    Yield the pages of a sequence in lexicographical topological order.
+    
+    Kahn's algorithm with in-degrees restricted to the sequence; among the
+    pages with no remaining predecessors the smallest is emitted first.
     
     Args:
-        rules: List of (before, after) pairs representing rules
-        seq: Input sequence
+        rules: Rule index of (before, after) pairs
+        seq: Sequence to sort
         
-    Returns:
-        nx.DiGraph: Directed graph representing the sequence order
+    Yields:
+        int: Next page in sorted order
+        
+    Raises:
+        ValueError: If the rules contain a cycle within the sequence
     """
-    G = nx.DiGraph()
-    # Add all nodes first to ensure isolated nodes are included
-    G.add_nodes_from(seq)
-    seq_set = set(seq)
-    G.add_edges_from((before, after) for before, after in rules 
-                    if before in seq_set and after in seq_set)
-    return G
+    nodes = list(dict.fromkeys(seq))
+    successors = {node: [] for node in nodes}
+    in_degree = dict.fromkeys(nodes, 0)
+    for before in nodes:
+        for after in nodes:
+            if (before, after) in rules:
+                successors[before].append(after)
+                in_degree[after] += 1
+    
+    ready = [node for node in nodes if in_degree[node] == 0]
+    heapq.heapify(ready)
+    emitted = 0
+    while ready:
+        node = heapq.heappop(ready)
+        emitted += 1
+        yield node
+        for after in successors[node]:
+            in_degree[after] -= 1
+            if in_degree[after] == 0:
+                heapq.heappush(ready, after)
+    if emitted != len(nodes):
+        raise ValueError("Rules contain a cycle within the sequence")
 
-def get_sorted_sequence(rules: List[Tuple[int, int]], seq: List[int]) -> List[int]:
+def get_sorted_sequence(rules: RuleIndex, seq: List[int]) -> List[int]:
     """
-    Get topologically sorted sequence using graph-based approach.
+    Get topologically sorted sequence.
     
     Args:
-        rules: List of rules
+        rules: Rule index of (before, after) pairs
         seq: Sequence to sort
         
     Returns:
         List[int]: Topologically sorted sequence
     """
-    G = build_graph(rules, seq)
-    return list(nx.lexicographical_topological_sort(G))
+    return list(iter_topological_order(rules, seq))
+
+def get_sorted_middle(rules: RuleIndex, seq: List[int]) -> int:
+    """
+    Get the middle number of the sorted sequence without sorting past it.
+    
+    Args:
+        rules: Rule index of (before, after) pairs
+        seq: Sequence to sort
+        
+    Returns:
+        int: Middle number of the topologically sorted sequence
+    """
+    order = iter_topological_order(rules, seq)
+    middle = next(islice(order, len(set(seq)) // 2, None), None)
+    if middle is None:
+        raise ValueError("Rules contain a cycle within the sequence")
+    return middle
 
-def part2(rules: List[Tuple[int, int]], seqs: List[List[int]]) -> int:
+def part2(rules: RuleIndex, seqs: List[List[int]]) -> int:
     """
     Solve part 2 of the puzzle.
     
     Args:
-        rules: List of rules
+        rules: Rule index of (before, after) pairs
         seqs: List of invalid sequences to process
         
     Returns:
         int: Sum of middle numbers from sorted sequences
     """
-    return sum(get_middle_number(get_sorted_sequence(rules, seq)) for seq in seqs)
+    return sum(get_sorted_middle(rules, seq) for seq in seqs)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from aocd import get_data
+from aoc2024.inputs import get_data
 
 def find_start_position(grid):
     """找到警卫的起始位置和方向"""
@@ -17,10 +17,18 @@ def is_valid_position(x, y, grid):
     """检查位置是否在地图范围内"""
     return 0 <= x < len(grid) and 0 <= y < len(grid[0])
 
-def simulate_guard_movement(grid):
-    # 找到起始位置和方向
+def encode_state(x, y, direction, width):
+    """把 (行, 列, 方向) 编码成一个整数: (行*宽+列)*4+方向"""
+    return (x * width + y) * 4 + direction
+
+def guard_path(grid):
+    """按顺序生成警卫的每个状态 (x, y, direction), 直到离开地图或进入循环"""
+    width = len(grid[0])
     x, y, direction = find_start_position(grid)
-    visited = set([(x, y)])  # 记录访问过的位置
+    # 用整数编码的状态在 bytearray 中记录是否出现过
+    seen = bytearray(len(grid) * width * 4)
+    seen[encode_state(x, y, direction, width)] = 1
+    yield x, y, direction
     
     while True:
         # 获取前方位置
@@ -37,9 +45,20 @@ def simulate_guard_movement(grid):
         else:
             # 向前移动
             x, y = next_x, next_y
-            visited.add((x, y))
-    
-    return len(visited)
+
+        state = encode_state(x, y, direction, width)
+        if seen[state]:
+            break  # 进入循环
+        seen[state] = 1
+        yield x, y, direction
+
+def simulate_guard_movement(grid):
+    width = len(grid[0])
+    # 记录访问过的位置 (行*宽+列)
+    visited = bytearray(len(grid) * width)
+    for x, y, _ in guard_path(grid):
+        visited[x * width + y] = 1
+    return visited.count(1)
 
 if __name__ == "__main__":
     data = get_data(year=2024, day=6)
@@ -1,7 +1,10 @@
-from aocd import get_data
-from typing import List, Set, Tuple
+from aoc2024.inputs import get_data
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from AoC_2024_day6_pt1 import guard_path
+import os
 
 class Direction(Enum):
     UP = (0, -1)
@@ -21,6 +24,77 @@ class Position:
     def __hash__(self):
         return hash((self.x, self.y))
 
+# 右转顺序: 上 -> 右 -> 下 -> 左
+DIRECTIONS = list(Direction)
+UP, RIGHT, DOWN, LEFT = range(4)
+
+class JumpTable:
+    """预计算每个格子沿四个方向前进时, 停在下一个障碍物前的位置"""
+    def __init__(self, grid: List[str]):
+        self.height = len(grid)
+        self.width = len(grid[0])
+        w = self.width
+        # stops[d][idx]: 从 idx 沿方向 d 前进后停下的格子, -1 表示走出地图
+        self.stops: List[List[int]] = [[-1] * (self.height * w) for _ in DIRECTIONS]
+        left, right = self.stops[LEFT], self.stops[RIGHT]
+        up, down = self.stops[UP], self.stops[DOWN]
+
+        for y in range(self.height):
+            row = grid[y]
+            base = y * w
+            stop = -1
+            for x in range(w):
+                if row[x] == '#':
+                    stop = base + x + 1
+                else:
+                    left[base + x] = stop
+            stop = -1
+            for x in range(w - 1, -1, -1):
+                if row[x] == '#':
+                    stop = base + x - 1
+                else:
+                    right[base + x] = stop
+
+        for x in range(w):
+            stop = -1
+            for y in range(self.height):
+                if grid[y][x] == '#':
+                    stop = (y + 1) * w + x
+                else:
+                    up[y * w + x] = stop
+            stop = -1
+            for y in range(self.height - 1, -1, -1):
+                if grid[y][x] == '#':
+                    stop = (y - 1) * w + x
+                else:
+                    down[y * w + x] = stop
+
+    def jump(self, idx: int, direction: int, obstacle: int = -1) -> int:
+        """从 idx 沿方向前进, 返回停下的格子 (-1 表示离开地图)
+
+        obstacle 为额外假设的障碍物格子 (-1 表示没有), 无需重建跳表。
+        """
+        stop = self.stops[direction][idx]
+        if obstacle < 0:
+            return stop
+        w = self.width
+        y, x = divmod(idx, w)
+        oy, ox = divmod(obstacle, w)
+        # 额外障碍物位于当前格子与原停止点之间时, 在它前一格停下
+        if direction == UP:
+            if ox == x and oy < y and (stop < 0 or oy >= stop // w):
+                return obstacle + w
+        elif direction == DOWN:
+            if ox == x and oy > y and (stop < 0 or oy <= stop // w):
+                return obstacle - w
+        elif direction == LEFT:
+            if oy == y and ox < x and (stop < 0 or ox >= stop % w):
+                return obstacle + 1
+        else:
+            if oy == y and ox > x and (stop < 0 or ox <= stop % w):
+                return obstacle - 1
+        return stop
+
 class GuardSimulator:
     def __init__(self, grid: List[str]):
         self.grid = grid
@@ -28,6 +102,10 @@ class GuardSimulator:
         self.width = len(grid[0])
         self.start_pos = self._find_start()
         self.direction = Direction.UP  # 初始方向向上
+        self.jump_table = JumpTable(grid)
+        # 状态编码为 (y*width+x)*4+方向, 按轮次标记, 避免每次清空
+        self._visited = bytearray(self.height * self.width * 4)
+        self._stamp = 0
         
     def _find_start(self) -> Position:
         """找到起始位置 (^)"""
@@ -43,51 +121,113 @@ class GuardSimulator:
                 0 <= pos.y < self.height and 
                 self.grid[pos.y][pos.x] != '#')
     
-    def detect_loop(self) -> bool:
-        """检测是否形成循环"""
-        visited_states: Set[Tuple[Position, Direction]] = set()
-        current_pos = self.start_pos
-        current_dir = self.direction
-        
+    def detect_loop(self, obstacle: Optional[Position] = None,
+                    start_pos: Optional[Position] = None,
+                    start_dir: Optional[Direction] = None) -> bool:
+        """检测是否形成循环
+
+        借助跳表每次直接移动到障碍物前, 只在转向点记录状态。
+        obstacle 为额外假设的障碍物位置; start_pos/start_dir 可从路线中途开始检测。
+        """
+        table = self.jump_table
+        obstacle_idx = -1 if obstacle is None else obstacle.y * self.width + obstacle.x
+        if start_pos is None:
+            start_pos = self.start_pos
+        if start_dir is None:
+            start_dir = self.direction
+        idx = start_pos.y * self.width + start_pos.x
+        direction = DIRECTIONS.index(start_dir)
+
+        visited = self._visited
+        self._stamp += 1
+        if self._stamp > 255:
+            # 标记用完后整体清零一次
+            visited[:] = bytes(len(visited))
+            self._stamp = 1
+        stamp = self._stamp
+
         while True:
-            state = (current_pos, current_dir)
-            if state in visited_states:
+            idx = table.jump(idx, direction, obstacle_idx)
+            if idx < 0:
+                return False
+
+            state = idx * 4 + direction
+            if visited[state] == stamp:
                 return True  # 找到循环
-            visited_states.add(state)
+            visited[state] = stamp
+            direction = (direction + 1) % 4  # 右转
 
-            next_pos = current_pos.move(current_dir)
+    def iter_path_candidates(self) -> Iterator[Tuple[Position, Position, Direction]]:
+        """沿原始路线生成每个首次进入的格子, 以及进入前警卫的位置和方向"""
+        seen = bytearray(self.height * self.width)
+        prev_pos, prev_dir = None, None
+        # guard_path 的坐标为 (行, 列)
+        for row, col, direction in guard_path(self.grid):
+            cell = row * self.width + col
+            if not seen[cell]:
+                seen[cell] = 1
+                if self.grid[row][col] == '.':
+                    yield Position(col, row), prev_pos, prev_dir
+            prev_pos, prev_dir = Position(col, row), DIRECTIONS[direction]
 
-            if not self.is_valid_position(next_pos):
-                return False
-            
-            if self.grid[next_pos.y][next_pos.x] == '#':
-                current_dir = Direction((current_dir.value[0] + 1) % 4)  # 右转
-            else:
-                current_pos = next_pos
-
-    def find_all_loop_positions(self) -> Set[Position]:
-        """找出所有可以形成循环的位置"""
-        loop_positions = set()
-        
+    def iter_candidates(self, on_path: bool = False) -> Iterator[Tuple[Position, Optional[Position], Optional[Direction]]]:
+        """生成待检测的 (障碍物位置, 起始位置, 起始方向)"""
+        if on_path:
+            yield from self.iter_path_candidates()
+            return
         for y in range(self.height):
             for x in range(self.width):
                 if self.grid[y][x] == '.':
-                    new_grid = [list(row) for row in self.grid]
-                    new_grid[y][x] = '#'
-                    simulator = GuardSimulator(new_grid)
-                    
-                    if simulator.detect_loop():
-                        loop_positions.add(Position(x, y))
-        
+                    yield Position(x, y), None, None
+
+    def find_all_loop_positions(self, on_path: bool = False, workers: int = 1,
+                                chunk_size: Optional[int] = None) -> Set[Position]:
+        """找出所有可以形成循环的位置
+
+        on_path 为 True 时只尝试原始路线上的格子, 并从首次进入该格子前的状态开始检测。
+        workers 大于 1 时把候选格子分块, 交给进程池并行检测。
+        """
+        candidates = list(self.iter_candidates(on_path))
+        if workers <= 1:
+            return _check_candidates(self, candidates)
+
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(candidates) // (workers * 4)))
+        chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+
+        loop_positions = set()
+        # 网格只在每个工作进程初始化时传递一次
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.grid,)) as executor:
+            for positions in executor.map(_check_chunk, chunks):
+                loop_positions |= positions
         return loop_positions
 
-def solve(input_data: str) -> int:
+def _check_candidates(simulator: GuardSimulator, candidates) -> Set[Position]:
+    """检测一批候选障碍物, 返回会形成循环的位置"""
+    return {
+        obstacle
+        for obstacle, start_pos, start_dir in candidates
+        if simulator.detect_loop(obstacle, start_pos, start_dir)
+    }
+
+# 工作进程内共享的只读模拟器
+_worker_simulator: Optional[GuardSimulator] = None
+
+def _init_worker(grid: List[str]) -> None:
+    global _worker_simulator
+    _worker_simulator = GuardSimulator(grid)
+
+def _check_chunk(candidates) -> Set[Position]:
+    return _check_candidates(_worker_simulator, candidates)
+
+def solve(input_data: str, workers: int = 1) -> int:
     grid = input_data.strip().splitlines()
     simulator = GuardSimulator(grid)
-    loop_positions = simulator.find_all_loop_positions()
+    loop_positions = simulator.find_all_loop_positions(on_path=True, workers=workers)
     return len(loop_positions)
 
 if __name__ == "__main__":
     data = get_data(year=2024, day=6)
-    result = solve(data)
+    result = solve(data, workers=os.cpu_count() or 1)
     print(f"There are {result} positions where an obstruction would create a loop")
\ No newline at end of file
@@ -1,13 +1,16 @@
-from aocd import get_data
-from functools import lru_cache
-from typing import Dict, List
-
-def data_process() -> Dict[int, List[int]]:
-    data = get_data(year=2024, day=7)
-    return {
-        int(line.split(":")[0].strip()): list(map(int, line.split(":")[1].strip().split()))
+from aoc2024.inputs import get_data
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterator, List, Optional, Tuple
+
+def parse_equations(data: Optional[str] = None) -> List[Tuple[int, List[int]]]:
+    """按输入顺序解析每一行方程 (目标值相同的方程也各自保留)"""
+    if data is None:
+        data = get_data(year=2024, day=7)
+    return [
+        (int(line.split(":")[0].strip()), list(map(int, line.split(":")[1].strip().split())))
         for line in data.splitlines()
-    }
+    ]
 
 
 def recursive_circuits(index: int, target: int, numbers: tuple, current_result: int) -> bool:
@@ -22,11 +25,39 @@ def recursive_circuits(index: int, target: int, numbers: tuple, current_result:
     return (recursive_circuits(index + 1, target, numbers, current_result + numbers[index]) or
             recursive_circuits(index + 1, target, numbers, current_result * numbers[index]))
 
-def part1(data: Dict[int, List[int]]) -> int:
+def reverse_circuits(index: int, target: int, numbers: tuple, concat: bool = False) -> bool:
+    """从目标值倒推，逐个撤销最后一个操作数，不可能的分支立即剪掉"""
+    last = numbers[index]
+    if index == 0:
+        return target == last
+
+    # 撤销加法：剩余值不能为负
+    if target >= last and reverse_circuits(index - 1, target - last, numbers, concat):
+        return True
+
+    # 撤销乘法：只有整除时才可能
+    if last == 0:
+        if target == 0:
+            return True
+    elif target % last == 0 and reverse_circuits(index - 1, target // last, numbers, concat):
+        return True
+
+    # 撤销拼接：目标必须以操作数的数字结尾
+    if concat:
+        shift = 10 ** len(str(last))
+        if (target >= last and (target - last) % shift == 0 and
+                reverse_circuits(index - 1, (target - last) // shift, numbers, concat)):
+            return True
+    return False
+
+def is_solvable(target: int, numbers: List[int], concat: bool = False) -> bool:
+    """判断方程是否有解，concat 为 True 时允许 || 运算符 (part 2)"""
+    return reverse_circuits(len(numbers) - 1, target, tuple(numbers), concat)
+
+def part1(equations: List[Tuple[int, List[int]]]) -> int:
     result = 0
-    for k, v in data.items():
-        # 从第一个元素开始，初始结果为 numbers[0]
-        if recursive_circuits(1, k, tuple(v),current_result=None):
+    for k, v in equations:
+        if is_solvable(k, v):
             result += k
     return result
 
@@ -44,18 +75,44 @@ def recursive_circuits_pt2(index: int, target: int, numbers: tuple, current_resu
             recursive_circuits_pt2(index + 1, target, numbers, current_result * numbers[index]) or
             recursive_circuits_pt2(index + 1, target, numbers, current_result *(10**len(str(numbers[index])))+ numbers[index])) 
 
-def part2(data: Dict[int, List[int]]) -> int:
+def part2(equations: List[Tuple[int, List[int]]]) -> int:
     result = 0
-    for k, v in data.items():
-        # 从第一个元素开始，初始结果为 numbers[0]
-        if recursive_circuits_pt2(1, k, tuple(v),current_result=None):
+    for k, v in equations:
+        if is_solvable(k, v, concat=True):
             result += k
     return result
 
+"""批量并行"""
+def _check_chunk(chunk: List[Tuple[int, List[int]]], concat: bool) -> List[bool]:
+    return [is_solvable(target, numbers, concat) for target, numbers in chunk]
+
+def _run_chunks(executor: ProcessPoolExecutor, items: List[Tuple[int, List[int]]],
+                concat: bool, chunk_size: int) -> Iterator[bool]:
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    for results in executor.map(partial(_check_chunk, concat=concat), chunks):
+        yield from results
+
+def evaluate_batch(equations: List[Tuple[int, List[int]]], workers: Optional[int] = None,
+                   chunk_size: int = 1000) -> List[Tuple[int, List[int], bool, bool]]:
+    """在进程池中分块检查所有方程
+
+    返回与输入逐行对应的 (目标值, 操作数, part 1 是否有解, part 2 是否有解)。
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        solved_pt1 = list(_run_chunks(executor, equations, False, chunk_size))
+        # part 1 有解的方程在 part 2 中必然有解, 只需搜索剩下的
+        remaining = [i for i, solved in enumerate(solved_pt1) if not solved]
+        solved_pt2 = list(solved_pt1)
+        found = _run_chunks(executor, [equations[i] for i in remaining], True, chunk_size)
+        for i, solved in zip(remaining, found):
+            solved_pt2[i] = solved
+    return [(target, numbers, pt1, pt2)
+            for (target, numbers), pt1, pt2 in zip(equations, solved_pt1, solved_pt2)]
+
 if __name__ == "__main__":
-    data = data_process()
-    result_pt1 = part1(data)
+    results = evaluate_batch(parse_equations())
+    result_pt1 = sum(target for target, _, pt1, _ in results if pt1)
     print(f"Part 1: {result_pt1}")
 
-    result_pt2 = part2(data)
+    result_pt2 = sum(target for target, _, _, pt2 in results if pt2)
     print(f"Part 2: {result_pt2}")
\ No newline at end of file
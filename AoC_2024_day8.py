@@ -1,97 +1,126 @@
 from collections import defaultdict
-from aocd import get_data
-
-def parse_input():
-    data = get_data(year=2024, day=8)
-    antennas = defaultdict(list)
-    for y, row in enumerate(data.splitlines()):
-        for x, c in enumerate(row):
-            if c != '.':
-                antennas[c].append((x, y))
-    return antennas
-
-def calculate_antinodes_part1(antennas):
-    """计算 Part 1 的反节点"""
-    antinodes = set()
-    for frequency, locations in antennas.items():
-        n = len(locations)
-        for i in range(n):
-            for j in range(i + 1, n):
-                x1, y1 = locations[i]
-                x2, y2 = locations[j]
-
-                x_a1 = 2 * x1 - x2
-                y_a1 = 2 * y1 - y2
-                x_a2 = 2 * x2 - x1
-                y_a2 = 2 * y2 - y1
-
-                antinodes.add((x_a1, y_a1))
-                antinodes.add((x_a2, y_a2))
-
-    return antinodes
-
-def calculate_antinodes_part2(antennas, width, height):
-    """计算 Part 2 的反节点"""
-    antinodes = set()
-    for frequency, locations in antennas.items():
-        n = len(locations)
-        for i in range(n):
-            for j in range(i + 1, n):
-                x1, y1 = locations[i]
-                x2, y2 = locations[j]
-
-                # 找到所有共线的点
-                dx = x2 - x1
-                dy = y2 - y1
-
-                # 如果两个点重合，跳过
-                if dx == 0 and dy == 0:
+from aoc2024.inputs import get_data
+import numpy as np
+
+# Part 2 每批处理的天线对数和展开的格点数上限, 限制临时数组的大小
+PAIRS_PER_BATCH = 1 << 16
+POINTS_PER_BATCH = 1 << 18
+
+class AntennaMap:
+    """天线地图: 只解析一次, 记录地图真实尺寸, 在位图上标记反节点"""
+    def __init__(self, data):
+        rows = data.splitlines()
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        self.antennas = defaultdict(list)
+        for y, row in enumerate(rows):
+            for x, c in enumerate(row):
+                if c != '.':
+                    self.antennas[c].append((x, y))
+
+    def new_bitmap(self):
+        return np.zeros((self.height, self.width), dtype=bool)
+
+    def mark(self, bitmap, xs, ys):
+        """在位图上标记地图范围内的点"""
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        bitmap[ys[inside], xs[inside]] = True
+
+    def count_part1(self):
+        """计算 Part 1 的反节点数量, 天线对分批处理, 每批约 PAIRS_PER_BATCH 对"""
+        bitmap = self.new_bitmap()
+        for locations in self.antennas.values():
+            points = np.array(locations, dtype=np.int64)
+            for i, j in self.iter_pairs(len(points)):
+                # 每对 (i, j) 有两个反节点: 2 * p_i - p_j 和 2 * p_j - p_i
+                self.mark(bitmap, 2 * points[i, 0] - points[j, 0], 2 * points[i, 1] - points[j, 1])
+                self.mark(bitmap, 2 * points[j, 0] - points[i, 0], 2 * points[j, 1] - points[i, 1])
+        return int(np.count_nonzero(bitmap))
+
+    def count_part2(self):
+        """计算 Part 2 的反节点数量, 天线对和格点都分批展开, 临时数组大小有上限"""
+        bitmap = self.new_bitmap()
+        for locations in self.antennas.values():
+            points = np.array(locations, dtype=np.int64)
+            for i, j in self.iter_pairs(len(points)):
+                x1, y1 = points[i, 0], points[i, 1]
+                dx, dy = points[j, 0] - x1, points[j, 1] - y1
+                # 跳过重合的天线
+                keep = (dx != 0) | (dy != 0)
+                x1, y1, dx, dy = x1[keep], y1[keep], dx[keep], dy[keep]
+                if not len(x1):
                     continue
-                
-                # 遍历直线上的所有点
-                if dx == 0:  # 垂直线
-                    for y in range(0,height):
-                        antinodes.add((x1, y))
-                elif dy == 0:  # 水平线
-                    for x in range(0,width):
-                        antinodes.add((x, y1))
-                else:  # 斜线
-                    for k in range(-max(width,height),max(width,height)):
-                        x = x1 + k
-                        y = y1 + (dy * k) // dx
-                        if (dy * k) % dx == 0:
-                            antinodes.add((x, y))
-    return antinodes
-
-def filter_antinodes(antinodes, width, height):
-    """过滤超出地图边界的反节点"""
-    filtered_antinodes = set()
-    for x, y in antinodes:
-        if 0 <= x < width and 0 <= y < height:
-            filtered_antinodes.add((x, y))
-    return filtered_antinodes
-
-def count_unique_antinodes(part):
+
+                g = np.gcd(dx, dy)
+                step_x, step_y = dx // g, dy // g
+                lo_x, hi_x = self.step_ranges(x1, step_x, self.width)
+                lo_y, hi_y = self.step_ranges(y1, step_y, self.height)
+                lo = np.maximum(lo_x, lo_y)
+                counts = np.minimum(hi_x, hi_y) - lo + 1
+
+                ends = np.cumsum(counts)
+                start = 0
+                while start < len(counts):
+                    # 至少取一对, 之后累计格点数不超过上限
+                    limit = ends[start] - counts[start] + POINTS_PER_BATCH
+                    stop = max(start + 1, int(np.searchsorted(ends, limit, side='right')))
+                    batch = slice(start, stop)
+                    self.mark_lines(bitmap, x1[batch], y1[batch], step_x[batch], step_y[batch],
+                                    lo[batch], counts[batch])
+                    start = stop
+        return int(np.count_nonzero(bitmap))
+
+    @staticmethod
+    def iter_pairs(n):
+        """按第一个天线分块生成所有 i < j 的天线对下标, 每块约 PAIRS_PER_BATCH 对"""
+        rows = max(1, PAIRS_PER_BATCH // max(n, 1))
+        others = np.arange(n)
+        for first in range(0, n - 1, rows):
+            block = np.arange(first, min(first + rows, n))
+            row, j = np.nonzero(others[None, :] > block[:, None])
+            yield block[row], j
+
+    def mark_lines(self, bitmap, x1, y1, step_x, step_y, lo, counts):
+        """每个天线对从 lo 开始展开成 counts 个步数 k, 在位图上标记对应格点"""
+        pair = np.repeat(np.arange(len(x1)), counts)
+        k = lo[pair] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        bitmap[y1[pair] + k * step_y[pair], x1[pair] + k * step_x[pair]] = True
+
+    @staticmethod
+    def step_ranges(start, step, size):
+        """返回使 0 <= start + t * step < size 成立的 t 的闭区间 (lo, hi), 按元素计算
+
+        step 为 0 的方向不限制步数。
+        """
+        magnitude = np.where(step == 0, 1, np.abs(step))
+        lo = -(start // magnitude)
+        hi = (size - 1 - start) // magnitude
+        unbounded = np.iinfo(np.int64).max // 4
+        lo, hi = np.where(step < 0, -hi, lo), np.where(step < 0, -lo, hi)
+        lo = np.where(step == 0, -unbounded, lo)
+        hi = np.where(step == 0, unbounded, hi)
+        return lo, hi
+
+def parse_input(data=None):
+    if data is None:
+        data = get_data(year=2024, day=8)
+    return AntennaMap(data)
+
+def count_unique_antinodes(part, antenna_map=None):
     """计算唯一反节点的数量，根据 part 选择计算方法"""
-    antennas = parse_input()
-    width = max(x for locs in antennas.values() for x, _ in locs) + 1
-    height = max(y for locs in antennas.values() for _, y in locs) + 1
+    if antenna_map is None:
+        antenna_map = parse_input()
 
     if part == 1:
-        antinodes = calculate_antinodes_part1(antennas)
+        return antenna_map.count_part1()
     elif part == 2:
-        antinodes = calculate_antinodes_part2(antennas, width, height)
+        return antenna_map.count_part2()
     else:
         raise ValueError("Invalid part number. Must be 1 or 2.")
 
-    filtered_antinodes = filter_antinodes(antinodes, width, height)
-    return len(filtered_antinodes)
-
-
-
-
 if __name__ == "__main__":
-    result_part1 = count_unique_antinodes(1)
+    antenna_map = parse_input()
+    result_part1 = count_unique_antinodes(1, antenna_map)
     print("Part 1:", result_part1)
-    result_part2 = count_unique_antinodes(2)
+    result_part2 = count_unique_antinodes(2, antenna_map)
     print("Part 2:", result_part2)
\ No newline at end of file
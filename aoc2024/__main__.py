@@ -0,0 +1,155 @@
+"""Command line entry point: ``python -m aoc2024 run --day 6 --part 2``.
+
+Subcommands: ``solve`` prints answers (served from the result cache when
+the input is unchanged), ``run`` times solvers on real inputs, ``generate``
+writes a synthetic input, and ``bench`` measures how solvers scale with
+input size.
+"""
+import argparse
+import json
+import sys
+
+from aoc2024.bench import bench_day
+from aoc2024.generators import GENERATORS
+from aoc2024.runner import run_day, solve
+from aoc2024.solvers import DAYS
+
+
+def _format(result) -> str:
+    lines = [f"Day {result['day']}"]
+    for key in ("parse", "part1", "part2"):
+        if key not in result:
+            continue
+        stats = result[key]
+        answer = f"  answer={stats['answer']}" if "answer" in stats else ""
+        lines.append(f"  {key:<6} min={stats['min_ns'] / 1e6:.3f}ms "
+                     f"median={stats['median_ns'] / 1e6:.3f}ms "
+                     f"p95={stats['p95_ns'] / 1e6:.3f}ms{answer}")
+    return "\n".join(lines)
+
+
+def _format_bench(result) -> str:
+    lines = [f"Day {result['day']}"]
+    for run in result["runs"]:
+        timings = "  ".join(f"{key}={run[key]['median_ns'] / 1e6:.3f}ms"
+                            for key in ("parse", "part1", "part2") if key in run)
+        lines.append(f"  {result['sweep']}={run['size']:<10} {timings}")
+    exponents = "  ".join(f"{key}~n^{k:.2f}" for key, k in result["exponents"].items()
+                          if k is not None)
+    lines.append(f"  scaling: {exponents}")
+    return "\n".join(lines)
+
+
+def _write_json(results, json_path) -> None:
+    payload = json.dumps(results, indent=2)
+    if json_path == "-":
+        print(payload)
+    else:
+        with open(json_path, "w") as f:
+            f.write(payload + "\n")
+
+
+def _param(value: str):
+    key, sep, raw = value.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {value!r}")
+    try:
+        return key, int(raw)
+    except ValueError:
+        pass
+    try:
+        return key, float(raw)
+    except ValueError:
+        return key, raw
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc2024")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve_cmd = commands.add_parser("solve", help="print answers, using the result cache")
+    solve_cmd.add_argument("--day", type=int, required=True, choices=DAYS)
+    solve_cmd.add_argument("--part", type=int, action="append", choices=(1, 2),
+                           help="part to solve (repeatable; default: both)")
+    solve_cmd.add_argument("--input", help="input file (default: the input store)")
+    solve_cmd.add_argument("--no-cache", action="store_true", help="bypass the result cache")
+
+    run = commands.add_parser("run", help="run and time solvers")
+    run.add_argument("--day", type=int, action="append", choices=DAYS,
+                     help="day to run (repeatable; default: all days)")
+    run.add_argument("--part", type=int, action="append", choices=(1, 2),
+                     help="part to run (repeatable; default: both)")
+    run.add_argument("--input", help="input file (only with a single --day)")
+    run.add_argument("--repeat", type=int, default=1, help="number of timed runs")
+    run.add_argument("--json", dest="json_path",
+                     help="write results as JSON to this file ('-' for stdout)")
+    run.add_argument("--profile", metavar="DIR",
+                     help="instrument hot functions and write pstats/collapsed stacks to DIR")
+
+    generate = commands.add_parser("generate", help="write a synthetic input to stdout")
+    generate.add_argument("--day", type=int, required=True, choices=sorted(GENERATORS))
+    generate.add_argument("--size", type=int, required=True)
+    generate.add_argument("--seed", type=int, default=0)
+
+    bench = commands.add_parser("bench", help="measure scaling on synthetic inputs")
+    bench.add_argument("--day", type=int, action="append", choices=sorted(GENERATORS),
+                       help="day to benchmark (repeatable; default: all days)")
+    bench.add_argument("--part", type=int, action="append", choices=(1, 2))
+    bench.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(",")],
+                       help="comma separated sizes (default: per-day geometric series)")
+    bench.add_argument("--steps", type=int, default=4, help="sizes in the default series")
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--param", action="append", default=[], type=_param, metavar="KEY=VALUE",
+                       help="generator keyword argument (repeatable), e.g. operands=12")
+    bench.add_argument("--sweep", metavar="KEY",
+                       help="sweep this generator keyword over --sizes instead of the size, "
+                            "e.g. --day 7 --sweep operands --sizes 4,6,8,10")
+    bench.add_argument("--json", dest="json_path")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "solve":
+        for part in args.part or (1, 2):
+            answer = solve(args.day, part, args.input, use_cache=not args.no_cache)
+            print(f"Day {args.day} part {part}: {answer}")
+        return 0
+
+    if args.command == "generate":
+        print(GENERATORS[args.day](args.size, seed=args.seed))
+        return 0
+
+    if args.command == "bench":
+        results = []
+        for day in args.day or sorted(GENERATORS):
+            if args.sweep and not args.sizes:
+                print("--sweep requires --sizes", file=sys.stderr)
+                return 2
+            result = bench_day(day, args.sizes, args.steps, args.repeat, args.seed, args.part,
+                               sweep=args.sweep, params=dict(args.param))
+            results.append(result)
+            print(_format_bench(result), file=sys.stderr if args.json_path == "-" else sys.stdout)
+        if args.json_path:
+            _write_json(results, args.json_path)
+        return 0
+
+    days = args.day or DAYS
+    if args.input and len(days) != 1:
+        print("--input requires exactly one --day", file=sys.stderr)
+        return 2
+
+    results = []
+    for day in days:
+        result = run_day(day, args.part, args.input, args.repeat, profile=args.profile)
+        results.append(result)
+        print(_format(result), file=sys.stderr if args.json_path == "-" else sys.stdout)
+
+    if args.json_path:
+        _write_json(results, args.json_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
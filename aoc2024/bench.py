@@ -0,0 +1,80 @@
+"""Scaling benchmarks: run each solver over a geometric series of input sizes."""
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+from aoc2024.generators import GENERATORS
+from aoc2024.runner import run_day
+
+# (first size, growth factor) per day; sizes are in each generator's unit
+DEFAULT_SERIES = {
+    1: (10_000, 4),
+    2: (10_000, 4),
+    3: (10_000, 4),
+    4: (64, 2),
+    5: (1_000, 4),
+    6: (16, 2),
+    7: (1_000, 4),
+    8: (32, 2),
+}
+
+
+def geometric_sizes(start: int, factor: float, steps: int) -> List[int]:
+    return [int(round(start * factor ** i)) for i in range(steps)]
+
+
+def scaling_exponent(sizes: Sequence[int], times: Sequence[float]) -> Optional[float]:
+    """Least-squares slope of log(time) against log(size), i.e. time ~ size**k."""
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, times) if s > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def bench_day(day: int, sizes: Optional[Sequence[int]] = None, steps: int = 4,
+              repeat: int = 3, seed: int = 0, parts: Optional[Sequence[int]] = None,
+              sweep: Optional[str] = None,
+              params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run ``day`` on generated inputs of increasing size.
+
+    ``params`` are passed to the generator as keyword arguments. With
+    ``sweep`` set, ``sizes`` are the values of that generator keyword (for
+    example ``operands`` on day 7) and the size argument is ``params["size"]``,
+    or the start of the day's default series.
+
+    Returns the per-size runner results and, for parsing and each part, the
+    empirical exponent k of time ~ size**k fitted to the median timings.
+    """
+    params = dict(params or {})
+    start, factor = DEFAULT_SERIES[day]
+    # the fixed size while another parameter is swept
+    base_size = params.pop("size", start)
+    if sizes is None:
+        if sweep:
+            raise ValueError("sizes are required when sweeping a generator parameter")
+        sizes = geometric_sizes(start, factor, steps)
+    runs = []
+    for size in sizes:
+        if sweep:
+            text = GENERATORS[day](base_size, seed=seed, **{**params, sweep: size})
+        else:
+            text = GENERATORS[day](size, seed=seed, **params)
+        # with AOC2024_PROFILE set, keep one report per size
+        label = f"day{day:02d}-{sweep or 'n'}{size}"
+        result = run_day(day, parts, repeat=repeat, text=text, label=label)
+        result["size"] = size
+        runs.append(result)
+
+    keys = [key for key in ("parse", "part1", "part2") if key in runs[0]]
+    exponents = {
+        key: scaling_exponent(sizes, [run[key]["median_ns"] for run in runs])
+        for key in keys
+    }
+    if sweep:
+        params["size"] = base_size
+    return {"day": day, "sweep": sweep or "size", "params": params, "sizes": list(sizes),
+            "runs": runs, "exponents": exponents}
@@ -0,0 +1,102 @@
+"""Persistent cache of solved answers keyed by the content of the input.
+
+An entry is keyed by (day, part, solver version, sha256 of the input
+bytes), so any change to the input or to the day's solver source misses.
+Entries are small JSON files; the least recently used ones are evicted
+once the directory grows past ``max_bytes``. The cache lives in
+``~/.cache/aoc2024/results`` unless ``AOC2024_RESULT_CACHE`` points
+elsewhere, and ``AOC2024_NO_CACHE`` bypasses it.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from aoc2024.inputs import DEFAULT_CACHE_DIR
+
+RESULT_CACHE_ENV = "AOC2024_RESULT_CACHE"
+NO_CACHE_ENV = "AOC2024_NO_CACHE"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def hash_input(data) -> str:
+    """sha256 of the input without its trailing newlines.
+
+    Accepts the text, or bytes / an mmap (hashed without copying), and gives
+    a file's mapping and its ``PuzzleInput.text()`` the same hash.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    end = len(data)
+    while end and data[end - 1] == ord("\n"):
+        end -= 1
+    with memoryview(data) as view, view[:end] as content:
+        return hashlib.sha256(content).hexdigest()
+
+
+def cache_disabled() -> bool:
+    return bool(os.environ.get(NO_CACHE_ENV))
+
+
+class ResultCache:
+    """Directory of cached answers with size-based LRU eviction."""
+
+    def __init__(self, directory: Optional[os.PathLike] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        if directory is None:
+            directory = os.environ.get(RESULT_CACHE_ENV, DEFAULT_CACHE_DIR / "results")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(day: int, part: int, version: str, input_hash: str) -> str:
+        raw = f"{day}:{part}:{version}:{input_hash}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)["answer"]
+        except (OSError, ValueError, KeyError):
+            return default
+        # a hit makes the entry the most recently used; the entry may have been
+        # evicted by another process meanwhile, or the cache may be read-only
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, answer: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"answer": answer}, f)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
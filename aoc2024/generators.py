@@ -0,0 +1,143 @@
+"""Seeded, reproducible generators for each day's input format.
+
+Every generator takes a size parameter first and a ``seed``; the same
+arguments always produce the same text. ``GENERATORS`` maps a day to its
+generator so benchmarks can sweep sizes uniformly.
+"""
+import random
+import string
+from typing import Callable, Dict, List
+
+
+def generate_day1(lines: int, seed: int = 0, low: int = 10000, high: int = 99999) -> str:
+    """Two columns of location ids separated by three spaces."""
+    rng = random.Random(seed)
+    return "\n".join(f"{rng.randint(low, high)}   {rng.randint(low, high)}" for _ in range(lines))
+
+
+def generate_day2(reports: int, seed: int = 0, min_levels: int = 5, max_levels: int = 8) -> str:
+    """Reports of levels; roughly half are safe, some fixable by the dampener."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(reports):
+        n = rng.randint(min_levels, max_levels)
+        if rng.random() < 0.5:
+            level = rng.randint(1, 50)
+            sign = rng.choice((1, -1))
+            levels = [level]
+            for _ in range(n - 1):
+                level += sign * rng.randint(1, 3)
+                levels.append(level)
+            if rng.random() < 0.5:
+                levels[rng.randrange(n)] = rng.randint(1, 99)
+        else:
+            levels = [rng.randint(1, 99) for _ in range(n)]
+        out.append(" ".join(map(str, levels)))
+    return "\n".join(out)
+
+
+def generate_day3(instructions: int, seed: int = 0) -> str:
+    """Corrupted memory: mul/do/don't instructions, near misses and noise."""
+    rng = random.Random(seed)
+    noise = string.ascii_lowercase + string.digits + "()[]{},'<>?!@#$%^&*+-_ "
+    out = []
+    for _ in range(instructions):
+        out.append("".join(rng.choice(noise) for _ in range(rng.randint(2, 20))))
+        roll = rng.random()
+        if roll < 0.7:
+            out.append(f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})")
+        elif roll < 0.8:
+            out.append("do()")
+        elif roll < 0.9:
+            out.append("don't()")
+        else:
+            out.append(rng.choice(("mul(4*", "mul ( 2 , 4 )", "mul[3,7]", "do_not_mul(5,5")))
+    return "".join(out)
+
+
+def generate_day4(size: int, seed: int = 0) -> str:
+    """A size x size word search over the letters of XMAS."""
+    rng = random.Random(seed)
+    return "\n".join("".join(rng.choice("XMAS") for _ in range(size)) for _ in range(size))
+
+
+def generate_day5(updates: int, seed: int = 0, min_len: int = 5, max_len: int = 23,
+                  valid_fraction: float = 0.5) -> str:
+    """Ordering rules (a total order over the pages) and page updates.
+
+    The page count grows with ``updates`` so that the number of rules is of
+    the same order as the number of updates. About ``valid_fraction`` of the
+    updates list their pages in rule order; the rest are random samples,
+    which are almost never valid.
+    """
+    rng = random.Random(seed)
+    n_pages = max(max_len, int((2 * updates) ** 0.5))
+    pages = list(range(10, 10 + n_pages))
+    rng.shuffle(pages)
+    rules = [f"{pages[i]}|{pages[j]}" for i in range(n_pages) for j in range(i + 1, n_pages)]
+    rng.shuffle(rules)
+    seqs = []
+    for _ in range(updates):
+        length = rng.randrange(min_len, max_len + 1, 2)
+        if rng.random() < valid_fraction:
+            seq = [pages[i] for i in sorted(rng.sample(range(n_pages), length))]
+        else:
+            seq = rng.sample(pages, length)
+        seqs.append(",".join(map(str, seq)))
+    return "\n".join(rules) + "\n\n" + "\n".join(seqs)
+
+
+def generate_day6(size: int, seed: int = 0, density: float = 0.05) -> str:
+    """A size x size guard map with obstacles at the given density."""
+    rng = random.Random(seed)
+    grid = [["#" if rng.random() < density else "." for _ in range(size)] for _ in range(size)]
+    row, col = rng.randrange(size), rng.randrange(size)
+    grid[row][col] = "^"
+    return "\n".join("".join(line) for line in grid)
+
+
+def generate_day7(equations: int, seed: int = 0, operands: int = 8, concat: bool = True) -> str:
+    """Equations with ``operands`` numbers each; about half are solvable."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(equations):
+        numbers = [rng.randint(1, 99) for _ in range(operands)]
+        target = numbers[0]
+        for number in numbers[1:]:
+            op = rng.randrange(3 if concat else 2)
+            if op == 0:
+                target += number
+            elif op == 1:
+                target *= number
+            else:
+                target = int(f"{target}{number}")
+        if rng.random() < 0.5:
+            target += rng.randint(1, 9)
+        out.append(f"{target}: {' '.join(map(str, numbers))}")
+    return "\n".join(out)
+
+
+FREQUENCIES = string.digits + string.ascii_letters
+
+
+def generate_day8(size: int, seed: int = 0, antennas_per_frequency: int = 4) -> str:
+    """A size x size antenna map with about ``size`` antennas in total."""
+    rng = random.Random(seed)
+    grid: List[List[str]] = [["."] * size for _ in range(size)]
+    n_frequencies = max(1, min(len(FREQUENCIES), size // antennas_per_frequency))
+    for frequency in FREQUENCIES[:n_frequencies]:
+        for _ in range(antennas_per_frequency):
+            grid[rng.randrange(size)][rng.randrange(size)] = frequency
+    return "\n".join("".join(line) for line in grid)
+
+
+GENERATORS: Dict[int, Callable[..., str]] = {
+    1: generate_day1,
+    2: generate_day2,
+    3: generate_day3,
+    4: generate_day4,
+    5: generate_day5,
+    6: generate_day6,
+    7: generate_day7,
+    8: generate_day8,
+}
@@ -0,0 +1,108 @@
+"""Offline input store.
+
+Inputs are resolved from an explicit file path or from a local cache laid
+out as ``<cache dir>/<year>/day<NN>.txt``. The cache directory defaults to
+``~/.cache/aoc2024`` and can be moved with ``AOC2024_INPUT_DIR``. Missing
+inputs are fetched once through aocd and stored, unless
+``AOC2024_OFFLINE`` is set.
+"""
+import mmap
+import os
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+CACHE_DIR_ENV = "AOC2024_INPUT_DIR"
+OFFLINE_ENV = "AOC2024_OFFLINE"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "aoc2024"
+
+PathLike = Union[str, os.PathLike]
+
+
+def cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+
+
+def input_path(year: int, day: int, directory: Optional[PathLike] = None) -> Path:
+    """Return the cache location for a (year, day) input."""
+    base = Path(directory) if directory is not None else cache_dir()
+    return base / str(year) / f"day{day:02d}.txt"
+
+
+def _fetch(year: int, day: int, target: Path) -> None:
+    if os.environ.get(OFFLINE_ENV):
+        raise FileNotFoundError(f"No cached input for {year} day {day} at {target}")
+    from aocd import get_data as fetch_data
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(fetch_data(year=year, day=day))
+
+
+class PuzzleInput:
+    """A puzzle input file exposed as memory-mapped bytes.
+
+    The file is mapped read-only, so large inputs live in the page cache
+    rather than as Python objects.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    @property
+    def data(self) -> Union[mmap.mmap, bytes]:
+        """The raw bytes of the input (a read-only mmap)."""
+        return self._map if self._map is not None else b""
+
+    def text(self) -> str:
+        """Decode the whole input, without the trailing newline (like aocd).
+
+        Decodes straight from the mapping, so the only copy is the str itself.
+        """
+        if self._map is None:
+            return ""
+        end = len(self._map)
+        while end and self._map[end - 1] == ord("\n"):
+            end -= 1
+        with memoryview(self._map) as view, view[:end] as content:
+            return str(content, "utf-8")
+
+    def lines(self) -> Iterator[str]:
+        """Lazily iterate over the lines of the input, newlines stripped."""
+        if self._map is None:
+            return
+        self._map.seek(0)
+        for line in iter(self._map.readline, b""):
+            yield line.decode().rstrip("\r\n")
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PuzzleInput":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def resolve(year: int, day: int, path: Optional[PathLike] = None) -> Path:
+    """Return the input file for (year, day), fetching it into the cache if needed."""
+    if path is not None:
+        return Path(path)
+    target = input_path(year, day)
+    if not target.exists():
+        _fetch(year, day, target)
+    return target
+
+
+def open_input(year: int, day: int, path: Optional[PathLike] = None) -> PuzzleInput:
+    """Open the input for (year, day), or the file at ``path`` if given."""
+    return PuzzleInput(resolve(year, day, path))
+
+
+def get_data(year: int, day: int, path: Optional[PathLike] = None) -> str:
+    """Drop-in replacement for ``aocd.get_data`` backed by the input store."""
+    with open_input(year, day, path) as puzzle:
+        return puzzle.text()
@@ -0,0 +1,176 @@
+"""Opt-in instrumentation of the solvers' hot functions.
+
+Enabled with ``python -m aoc2024 run --profile DIR`` or by setting
+``AOC2024_PROFILE=DIR``. While a ``Profiler`` is active the functions listed
+in ``HOT_FUNCTIONS`` are replaced by wrappers that record call counts,
+cumulative time and tracemalloc peak memory; the originals are restored on
+exit. Nothing is patched when profiling is off, so it costs nothing then.
+
+Output, per day: ``dayNN.pstats`` (cProfile, for pstats/snakeviz),
+``dayNN.collapsed`` (``a;b;c <microseconds>`` lines for flamegraph.pl or
+speedscope) and ``dayNN.json`` (the per-function counters). ``bench`` adds
+the input size to the name (``dayNN-nSIZE.*``) so each size keeps its report.
+"""
+import cProfile
+import functools
+import importlib
+import inspect
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROFILE_ENV = "AOC2024_PROFILE"
+
+# "module:qualname" of the functions worth instrumenting, per day
+HOT_FUNCTIONS: Dict[int, List[str]] = {
+    1: ["AoC_2024_day1:similarity_score_array", "AoC_2024_day1:pt2_array"],
+    2: ["AoC_2024_day2:is_safe", "AoC_2024_day2:is_safe_dampened"],
+    3: ["AoC_2024_day3:pt1", "AoC_2024_day3:pt2", "AoC_2024_day3:MulInstructionProcessor.feed"],
+    4: ["AoC_2024_day4_pt1:count_word", "AoC_2024_day4_pt2:XMASFinder.count_patterns"],
+    5: ["AoC_2024_day5:is_valid_seq", "AoC_2024_day5:get_sorted_middle",
+        "AoC_2024_day5:iter_topological_order"],
+    6: ["AoC_2024_day6_pt1:simulate_guard_movement",
+        "AoC_2024_day6_pt2:GuardSimulator.find_all_loop_positions",
+        "AoC_2024_day6_pt2:GuardSimulator.detect_loop", "AoC_2024_day6_pt2:JumpTable.jump"],
+    7: ["AoC_2024_day7:is_solvable", "AoC_2024_day7:reverse_circuits"],
+    8: ["AoC_2024_day8:AntennaMap.count_part1", "AoC_2024_day8:AntennaMap.count_part2"],
+}
+
+
+def profile_dir(explicit: Optional[str] = None) -> Optional[Path]:
+    """The output directory if profiling is requested, else None."""
+    value = explicit or os.environ.get(PROFILE_ENV)
+    return Path(value) if value else None
+
+
+@dataclass
+class FunctionStats:
+    calls: int = 0
+    cumulative_ns: int = 0
+    peak_bytes: int = 0
+
+
+@dataclass
+class _Frame:
+    name: str
+    start_ns: int
+    child_ns: int = 0
+    peak_bytes: int = 0
+
+
+def _resolve(target: str) -> Tuple[object, str]:
+    module_name, qualname = target.split(":")
+    owner = importlib.import_module(module_name)
+    *parents, attr = qualname.split(".")
+    for parent in parents:
+        owner = getattr(owner, parent)
+    return owner, attr
+
+
+class Profiler:
+    """Context manager that instruments hot functions and writes the reports."""
+
+    def __init__(self, targets: List[str], out_dir: Path, label: str):
+        self.targets = targets
+        self.out_dir = Path(out_dir)
+        self.label = label
+        self.stats: Dict[str, FunctionStats] = {}
+        self.collapsed: Dict[str, int] = {}
+        self._stack: List[_Frame] = []
+        self._patched: List[Tuple[object, str, Callable]] = []
+        self._profile = cProfile.Profile()
+        self._started_tracemalloc = False
+
+    def _wrap(self, name: str, func: Callable) -> Callable:
+        stats = self.stats.setdefault(name, FunctionStats())
+        stack = self._stack
+
+        def enter() -> Tuple[_Frame, bool]:
+            # hand the peak reached so far to the enclosing frames before resetting it
+            peak = tracemalloc.get_traced_memory()[1]
+            for frame in stack:
+                frame.peak_bytes = max(frame.peak_bytes, peak)
+            tracemalloc.reset_peak()
+            outermost = all(frame.name != name for frame in stack)
+            frame = _Frame(name, time.perf_counter_ns())
+            stack.append(frame)
+            return frame, outermost
+
+        def leave(frame: _Frame, outermost: bool) -> None:
+            elapsed = time.perf_counter_ns() - frame.start_ns
+            # a generator may be closed after its caller has moved on
+            depth = next(i for i, f in enumerate(stack) if f is frame)
+            del stack[depth]
+            outer_frames = stack[:depth]
+            peak = tracemalloc.get_traced_memory()[1]
+            frame.peak_bytes = max(frame.peak_bytes, peak)
+            for outer in outer_frames:
+                outer.peak_bytes = max(outer.peak_bytes, peak)
+            if outer_frames:
+                outer_frames[-1].child_ns += elapsed
+            stats.calls += 1
+            # recursive calls are already covered by the outermost one
+            if outermost:
+                stats.cumulative_ns += elapsed
+            stats.peak_bytes = max(stats.peak_bytes, frame.peak_bytes)
+            key = ";".join([self.label] + [f.name for f in outer_frames] + [name])
+            self.collapsed[key] = self.collapsed.get(key, 0) + elapsed - frame.child_ns
+
+        if inspect.isgeneratorfunction(func):
+            # time the whole iteration, not just the creation of the generator
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                frame, outermost = enter()
+                try:
+                    return (yield from func(*args, **kwargs))
+                finally:
+                    leave(frame, outermost)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                frame, outermost = enter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    leave(frame, outermost)
+
+        return wrapper
+
+    def __enter__(self) -> "Profiler":
+        for target in self.targets:
+            owner, attr = _resolve(target)
+            original = owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)
+            self._patched.append((owner, attr, original))
+            setattr(owner, attr, self._wrap(target.split(":")[1], original))
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._profile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        for owner, attr, original in reversed(self._patched):
+            setattr(owner, attr, original)
+        self._patched.clear()
+        self.write()
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        return {name: asdict(stats) for name, stats in self.stats.items()}
+
+    def write(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        base = self.out_dir / self.label
+        self._profile.dump_stats(f"{base}.pstats")
+        with open(f"{base}.collapsed", "w") as f:
+            for key, ns in sorted(self.collapsed.items()):
+                f.write(f"{key} {max(ns // 1000, 0)}\n")
+        with open(f"{base}.json", "w") as f:
+            json.dump(self.report(), f, indent=2)
+            f.write("\n")
@@ -0,0 +1,120 @@
+"""Time the solvers: parsing and each part separately, over repeated runs."""
+import math
+import numbers
+import statistics
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Sequence
+
+from aoc2024.cache import ResultCache, cache_disabled, hash_input
+from aoc2024.inputs import open_input
+from aoc2024.profiling import HOT_FUNCTIONS, Profiler, profile_dir
+from aoc2024.solvers import get_solver
+
+YEAR = 2024
+
+_MISSING = object()
+
+
+def summarize(samples_ns: Sequence[int]) -> Dict[str, float]:
+    """min, median and p95 (nearest rank) of a list of durations in ns."""
+    ordered = sorted(samples_ns)
+    p95_rank = max(1, math.ceil(0.95 * len(ordered)))
+    return {
+        "min_ns": ordered[0],
+        "median_ns": statistics.median(ordered),
+        "p95_ns": ordered[p95_rank - 1],
+    }
+
+
+def _jsonable(answer: Any) -> Any:
+    if isinstance(answer, numbers.Integral):
+        return int(answer)
+    return answer
+
+
+def run_day(day: int, parts: Optional[Sequence[int]] = None, path: Optional[str] = None,
+            repeat: int = 1, text: Optional[str] = None,
+            profile: Optional[str] = None, label: Optional[str] = None) -> Dict[str, Any]:
+    """Run one day's solver ``repeat`` times and return timings and answers.
+
+    The input is read once from ``text``, ``path`` or the input store; only
+    parsing and the parts themselves are timed. With ``profile`` (or
+    ``AOC2024_PROFILE``) set, the hot functions are instrumented and the
+    reports are written to that directory as ``label.*`` (default ``dayNN``);
+    timings then include the overhead.
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    out_dir = profile_dir(profile)
+    profiler = (Profiler(HOT_FUNCTIONS.get(day, []), out_dir, label or f"day{day:02d}")
+                if out_dir else None)
+    with profiler or nullcontext():
+        result = _run(day, parts, path, repeat, text)
+    if profiler:
+        result["profile"] = profiler.report()
+    return result
+
+
+def _run(day: int, parts: Optional[Sequence[int]], path: Optional[str],
+         repeat: int, text: Optional[str]) -> Dict[str, Any]:
+    # the solver is built inside the profiler so its adapters see the wrappers
+    solver = get_solver(day)
+    parts = list(parts) if parts else sorted(solver.parts)
+    if text is None:
+        with open_input(YEAR, day, path) as puzzle:
+            text = puzzle.text()
+            path = str(puzzle.path)
+
+    parse_ns: List[int] = []
+    part_ns: Dict[int, List[int]] = {part: [] for part in parts}
+    answers: Dict[int, Any] = {}
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        parsed = solver.parse(text)
+        parse_ns.append(time.perf_counter_ns() - start)
+        for part in parts:
+            start = time.perf_counter_ns()
+            answers[part] = solver.parts[part](parsed)
+            part_ns[part].append(time.perf_counter_ns() - start)
+
+    result: Dict[str, Any] = {
+        "day": day,
+        "input": path,
+        "repeat": repeat,
+        "parse": summarize(parse_ns),
+    }
+    for part in parts:
+        result[f"part{part}"] = dict(summarize(part_ns[part]), answer=_jsonable(answers[part]))
+    return result
+
+
+def solve(day: int, part: int, path: Optional[str] = None, text: Optional[str] = None,
+          cache: Optional[ResultCache] = None, use_cache: bool = True) -> Any:
+    """Return the answer for one part, served from the result cache when possible.
+
+    The cache key covers the day, part, solver version and a hash of the
+    input. ``use_cache=False`` or ``AOC2024_NO_CACHE`` bypasses the cache,
+    and the input is then not hashed at all.
+    """
+    solver = get_solver(day)
+    if part not in solver.parts:
+        raise ValueError(f"Day {day} has no part {part}")
+    use_cache = use_cache and not cache_disabled()
+    if cache is None and use_cache:
+        cache = ResultCache()
+
+    with open_input(YEAR, day, path) if text is None else nullcontext() as puzzle:
+        if use_cache:
+            input_hash = hash_input(puzzle.data if puzzle else text)
+            key = ResultCache.key(day, part, solver.version, input_hash)
+            answer = cache.get(key, _MISSING)
+            if answer is not _MISSING:
+                return answer
+        if puzzle:
+            text = puzzle.text()
+
+    answer = _jsonable(solver.parts[part](solver.parse(text)))
+    if use_cache:
+        cache.put(key, answer)
+    return answer
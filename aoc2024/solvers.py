@@ -0,0 +1,118 @@
+"""Registry of the daily solvers behind a common parse/part interface.
+
+Each day's script keeps its own API; the adapters here only translate the
+raw input text into what the script expects and call its part functions.
+Solver modules are imported lazily, so listing the registry stays cheap.
+
+``version`` tags the answers in the result cache. It is a hash of the
+day's adapter and solver module sources, so editing either invalidates
+that day's cached answers and leaves the other days' alone.
+"""
+import hashlib
+import importlib
+import inspect
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+
+@dataclass(frozen=True)
+class Solver:
+    day: int
+    parse: Callable[[str], Any]
+    parts: Dict[int, Callable[[Any], Any]] = field(default_factory=dict)
+    version: str = ""
+
+
+def _module(name: str):
+    return importlib.import_module(name)
+
+
+def _source_version(factory: Callable[[], Solver], *modules) -> str:
+    """Hash of an adapter's source and the source files of its solver modules."""
+    digest = hashlib.sha256(inspect.getsource(factory).encode())
+    for module in modules:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _day1() -> Solver:
+    m = _module("AoC_2024_day1")
+    return Solver(1, m.parse_numbers_array, {
+        1: lambda lr: m.similarity_score_array(*lr),
+        2: lambda lr: m.pt2_array(*lr),
+    }, version=_source_version(_day1, m))
+
+
+def _day2() -> Solver:
+    m = _module("AoC_2024_day2")
+    return Solver(2, lambda text: [[int(y) for y in x.split(' ')] for x in text.splitlines()], {
+        1: lambda reports: sum(m.is_safe(line) for line in reports),
+        2: lambda reports: sum(m.is_safe_dampened(line) for line in reports),
+    }, version=_source_version(_day2, m))
+
+
+def _day3() -> Solver:
+    m = _module("AoC_2024_day3")
+    return Solver(3, lambda text: text, {1: m.pt1, 2: m.pt2},
+                  version=_source_version(_day3, m))
+
+
+def _day4() -> Solver:
+    pt1 = _module("AoC_2024_day4_pt1")
+    pt2 = _module("AoC_2024_day4_pt2")
+    return Solver(4, pt1.load_grid, {
+        1: lambda grid: pt1.WordFinder(grid).find_all_xmas(),
+        2: lambda grid: pt2.XMASFinder(pt2.Matrix(grid)).count_patterns(),
+    }, version=_source_version(_day4, pt1, pt2))
+
+
+def _day5() -> Solver:
+    m = _module("AoC_2024_day5")
+
+    def part2(parsed):
+        rules, seqs = parsed
+        return m.part2(rules, [seq for seq in seqs if not m.is_valid_seq(rules, seq)])
+
+    return Solver(5, m.data_process, {1: lambda parsed: m.part1(*parsed), 2: part2},
+                  version=_source_version(_day5, m))
+
+
+def _day6() -> Solver:
+    pt1 = _module("AoC_2024_day6_pt1")
+    pt2 = _module("AoC_2024_day6_pt2")
+    return Solver(6, lambda text: text.strip().splitlines(), {
+        1: pt1.simulate_guard_movement,
+        2: lambda grid: len(pt2.GuardSimulator(grid).find_all_loop_positions(on_path=True)),
+    }, version=_source_version(_day6, pt1, pt2))
+
+
+def _day7() -> Solver:
+    m = _module("AoC_2024_day7")
+    return Solver(7, m.parse_equations, {1: m.part1, 2: m.part2},
+                  version=_source_version(_day7, m))
+
+
+def _day8() -> Solver:
+    m = _module("AoC_2024_day8")
+    return Solver(8, m.parse_input, {
+        1: lambda antenna_map: antenna_map.count_part1(),
+        2: lambda antenna_map: antenna_map.count_part2(),
+    }, version=_source_version(_day8, m))
+
+
+_FACTORIES: Dict[int, Callable[[], Solver]] = {
+    1: _day1, 2: _day2, 3: _day3, 4: _day4,
+    5: _day5, 6: _day6, 7: _day7, 8: _day8,
+}
+
+DAYS = sorted(_FACTORIES)
+
+
+def get_solver(day: int) -> Solver:
+    """Import the solver module(s) for ``day`` and return its adapter."""
+    try:
+        factory = _FACTORIES[day]
+    except KeyError:
+        raise ValueError(f"No solver for day {day}; available: {DAYS}")
+    return factory()